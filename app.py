@@ -3,10 +3,11 @@ import pandas as pd
 import numpy as np
 import plotly.graph_objects as go
 
-from data_audit import load_and_clean_data, find_col
+from data_audit import load_and_clean_data, data_mtimes, find_col
 from scoring_engine import (compute_dimension_scores, get_gap_analysis,
                              compute_momentum, get_silent_winner_flag,
-                             get_customer_persona)
+                             get_customer_persona, get_restaurant_row,
+                             build_monthly_by_slug)
 from report_generator import generate_pdf_report
 
 # ─── PAGE CONFIG ──────────────────────────────────────────────────────────────────
@@ -130,14 +131,26 @@ div[data-testid="metric-container"] { background: transparent !important; }
 
 
 # ─── LOAD DATA ────────────────────────────────────────────────────────────────────
-# IMPORTANT: if you update your CSV files you must clear the Streamlit cache.
-# Either restart the app or call load_data.clear() programmatically.
-@st.cache_data(show_spinner=False)
-def load_data():
-    return load_and_clean_data()   # data_audit._resolve_path() finds the CSVs automatically
+# The engine is loaded once per data version and shared by every session
+# (cache_resource, no per-session copies), so treat its frames as read-only.
+# data_key is the CSV mtimes: updated files are picked up on the next rerun.
+@st.cache_resource(show_spinner=False, max_entries=1)
+def load_engine(data_key):
+    df_rest, df_rev, benchmarks = load_and_clean_data()
+    return {
+        "rest":  df_rest,
+        "rev":   df_rev,
+        "bench": benchmarks,
+        "mom":   build_monthly_by_slug(df_rev),
+    }
+
+data_key = data_mtimes()
 
 with st.spinner("Loading intelligence engine..."):
-    df_rest, df_rev, benchmarks = load_data()
+    engine = load_engine(data_key)
+
+df_rest, df_rev, benchmarks = engine["rest"], engine["rev"], engine["bench"]
+monthly_by_slug = engine["mom"]
 
 restaurant_names = sorted(df_rest["name"].dropna().unique().tolist())
 
@@ -182,14 +195,14 @@ with st.sidebar:
 # ─── COMPUTE ──────────────────────────────────────────────────────────────────────
 scores      = compute_dimension_scores(selected_restaurant, df_rest, df_rev)
 gaps        = get_gap_analysis(scores, benchmarks)
-momentum    = compute_momentum(selected_restaurant, df_rev, df_rest)
+momentum    = compute_momentum(selected_restaurant, df_rev, df_rest, monthly_by_slug)
 persona     = get_customer_persona(selected_restaurant, df_rest, df_rev)
 silent_flag = get_silent_winner_flag(selected_restaurant, df_rest)
-res_data    = df_rest[df_rest["name"] == selected_restaurant].iloc[0]
+res_data    = get_restaurant_row(selected_restaurant, df_rest)
 
 # District ranking
 @st.cache_data(show_spinner=False)
-def compute_all_ranks(_df_rest, _df_rev):
+def compute_all_ranks(_df_rest, _df_rev, data_key):
     out = []
     for _, r in _df_rest.iterrows():
         try:
@@ -203,7 +216,7 @@ def compute_all_ranks(_df_rest, _df_rev):
         .reset_index(drop=True)
     )
 
-df_ranks = compute_all_ranks(df_rest, df_rev)
+df_ranks = compute_all_ranks(df_rest, df_rev, data_key)
 df_ranks["rank"] = df_ranks.index + 1
 cur_rank = int(df_ranks[df_ranks["name"] == selected_restaurant]["rank"].values[0])
 total    = len(df_ranks)
@@ -472,7 +485,7 @@ with cm1:
 with cm2:
     if "_slug" in df_rest.columns and "_slug" in df_rev.columns:
         try:
-            rest_slug = df_rest[df_rest["name"] == selected_restaurant].iloc[0]["_slug"]
+            rest_slug = res_data["_slug"]
             sub = df_rev[df_rev["_slug"] == rest_slug]
         except (IndexError, KeyError):
             sub = pd.DataFrame()
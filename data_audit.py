@@ -3,10 +3,26 @@ data_audit.py  –  Loads, cleans and enriches restaurant + review CSV data.
 VERSION 1.4: Enhanced Path Resolution for Streamlit Cloud Deployment.
 """
 import os
+import json
+import hashlib
+import functools
 import pandas as pd
 import numpy as np
 import re
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, date
+
+try:
+    import pyarrow  # noqa: F401  – enables pandas' multithreaded CSV engine + Parquet
+    _CSV_ENGINE = "pyarrow"
+    _HAS_PARQUET = True
+except ImportError:
+    _CSV_ENGINE = "c"
+    _HAS_PARQUET = False
+
+_CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".cache")
+# Bump whenever the enriched frames change (columns, dtypes, index, scoring
+# inputs): stale .cache/ files from an older version are then ignored.
+_CACHE_VERSION = 1
 
 # ── Path resolution ───────────────────────────────────────────────────────────────
 def _resolve_path(filename: str) -> str:
@@ -33,34 +49,128 @@ def _resolve_path(filename: str) -> str:
 
 # ── Public entry point ────────────────────────────────────────────────────────────
 def load_and_clean_data(
-    restaurants_path: str = "restaurants.csv",
-    reviews_path:     str = "reviews.csv",
+    restaurants_path:  str = "restaurants.csv",
+    reviews_path:      str = "reviews.csv",
+    reviews_chunksize: int | None = None,
+    use_disk_cache:    bool = True,
 ):
     """
     Load, clean and enrich both CSVs. 
     Matches the signature expected by app.py.
+
+    With reviews_chunksize set, reviews are streamed in chunks and only the
+    per-restaurant aggregates are kept; the returned df_rev is then empty
+    (columns only), so use it for batch scoring of very large review files.
+
+    Enriched results are persisted to Parquet under .cache/ and reused while
+    both CSVs are unchanged (same day only, since relative German dates are
+    resolved against today) and _CACHE_VERSION matches. Requires pyarrow;
+    skipped otherwise.
     """
     # Resolve absolute paths before passing to loaders
     abs_rest_path = _resolve_path(restaurants_path)
     abs_rev_path  = _resolve_path(reviews_path)
 
+    use_disk_cache = use_disk_cache and _HAS_PARQUET and not reviews_chunksize
+    if use_disk_cache:
+        cached = _read_disk_cache(abs_rest_path, abs_rev_path)
+        if cached is not None:
+            return cached
+
     df_rest = _load_restaurants(abs_rest_path)
-    df_rev  = _load_reviews(abs_rev_path)
-    
+
+    # One reference time for date parsing and recency cutoffs alike
+    today = datetime.now()
+
     # Enrichment logic
-    df_rest = _enrich_restaurants(df_rest, df_rev)
+    if reviews_chunksize:
+        df_rev, rev_agg = _stream_review_aggregates(abs_rev_path, reviews_chunksize, today)
+        df_rest = _enrich_restaurants(df_rest, df_rev, rev_agg)
+    else:
+        df_rev  = _load_reviews(abs_rev_path, today)
+        df_rest = _enrich_restaurants(df_rest, df_rev, today=today)
     benchmarks = _compute_benchmarks(df_rest)
-    
+
+    # Index by name so scoring lookups are O(1); the index stays unnamed so
+    # "name" remains an unambiguous column for groupby/sort.
+    df_rest.index = df_rest["name"].to_numpy()
+
+    if use_disk_cache:
+        _write_disk_cache(abs_rest_path, abs_rev_path, df_rest, df_rev, benchmarks)
+
     return df_rest, df_rev, benchmarks
 
 
+def data_mtimes(
+    restaurants_path: str = "restaurants.csv",
+    reviews_path:     str = "reviews.csv",
+) -> tuple:
+    """Modification times of both CSVs – a cache key for anything derived from them."""
+    return tuple(
+        os.path.getmtime(p) if os.path.exists(p) else 0.0
+        for p in (_resolve_path(restaurants_path), _resolve_path(reviews_path))
+    )
+
+
+# ── Disk cache ────────────────────────────────────────────────────────────────────
+def _cache_path(rest_path: str, rev_path: str) -> str:
+    """Base path (without extension) of the on-disk cache for this pair of CSVs."""
+    key = hashlib.sha1(
+        f"{os.path.abspath(rest_path)}|{os.path.abspath(rev_path)}".encode()
+    ).hexdigest()[:16]
+    return os.path.join(_CACHE_DIR, f"enriched_v{_CACHE_VERSION}_{key}")
+
+
+def _cache_stamp(rest_path: str, rev_path: str) -> dict:
+    return {
+        "mtimes":  [os.path.getmtime(rest_path), os.path.getmtime(rev_path)],
+        "date":    date.today().isoformat(),
+        "version": _CACHE_VERSION,
+    }
+
+
+def _read_disk_cache(rest_path: str, rev_path: str):
+    base = _cache_path(rest_path, rev_path)
+    try:
+        with open(base + ".json", encoding="utf-8") as f:
+            meta = json.load(f)
+        if meta["stamp"] != _cache_stamp(rest_path, rev_path):
+            return None
+        df_rest = pd.read_parquet(base + "_rest.parquet")
+        df_rev  = pd.read_parquet(base + "_rev.parquet")
+    except (OSError, ValueError, KeyError):
+        return None
+    return df_rest, df_rev, meta["benchmarks"]
+
+
+def _write_disk_cache(rest_path, rev_path, df_rest, df_rev, benchmarks) -> None:
+    base = _cache_path(rest_path, rev_path)
+    try:
+        os.makedirs(_CACHE_DIR, exist_ok=True)
+        df_rest.to_parquet(base + "_rest.parquet")
+        df_rev.to_parquet(base + "_rev.parquet")
+        # Sidecar last, so a partial write is never treated as a valid cache
+        with open(base + ".json", "w", encoding="utf-8") as f:
+            json.dump({
+                "stamp":      _cache_stamp(rest_path, rev_path),
+                "benchmarks": benchmarks,
+            }, f)
+    except (OSError, ValueError):
+        pass  # read-only deployments simply skip persistence
+
+
 # ── Restaurant loader ─────────────────────────────────────────────────────────────
 def _load_restaurants(path: str) -> pd.DataFrame:
     # Ensure path exists before reading
     if not os.path.exists(path):
         raise FileNotFoundError(f"Critical Error: Data file not found at {path}")
         
-    df = pd.read_csv(path, encoding="utf-8-sig")
+    df = pd.read_csv(path, encoding="utf-8-sig", engine=_CSV_ENGINE)
+
+    # Normalize the URL column to StringDtype once; downstream code never re-casts it
+    url_col = find_col(df, ["page_url", "url", "link"])
+    if url_col:
+        df[url_col] = df[url_col].astype("string")
 
     rating_col = find_col(df, ["rating"])
     if rating_col:
@@ -77,10 +187,13 @@ def _load_restaurants(path: str) -> pd.DataFrame:
         df["rating_n"] = 0.0
 
     rev_col = find_col(df, ["review_count", "review_co", "reviews", "rev_count"])
-    df["rev_count_n"] = df[rev_col].apply(_parse_int) if rev_col else 0
+    df["rev_count_n"] = _parse_ints(df[rev_col]) if rev_col else 0
 
-    if not find_col(df, ["district"]):
-        df["district"] = "Frankfurt City"
+    district_col = find_col(df, ["district"])
+    if not district_col:
+        district_col = "district"
+        df[district_col] = "Frankfurt City"
+    df[district_col] = df[district_col].astype("category")
     if not find_col(df, ["price"]):
         df["price"] = "20-30"
 
@@ -88,16 +201,27 @@ def _load_restaurants(path: str) -> pd.DataFrame:
 
 
 # ── Review loader ─────────────────────────────────────────────────────────────────
-def _load_reviews(path: str) -> pd.DataFrame:
+def _load_reviews(path: str, today: datetime | None = None) -> pd.DataFrame:
     if not os.path.exists(path):
         raise FileNotFoundError(f"Critical Error: Review data not found at {path}")
         
-    df = pd.read_csv(path, encoding="utf-8-sig")
+    df = pd.read_csv(path, encoding="utf-8-sig", engine=_CSV_ENGINE)
+    return _clean_reviews(df, today)
+
+
+def _clean_reviews(df: pd.DataFrame, today: datetime | None = None) -> pd.DataFrame:
+    # Normalize the URL column to StringDtype once; downstream code never re-casts it
+    url_col = find_col(df, ["page_url", "url", "link"])
+    if url_col:
+        df[url_col] = df[url_col].astype("string")
 
     date_col = find_col(df, ["review_date", "date", "review_time", "reviewer_data"])
     df["normalized_date"] = (
-        df[date_col].apply(_parse_german_date) if date_col else datetime.now()
+        _parse_german_dates_vec(df[date_col], today) if date_col
+        else (today or datetime.now())
     )
+    # Stored as datetime64 once; consumers use .dt / comparisons without re-parsing
+    df["normalized_date"] = pd.to_datetime(df["normalized_date"])
 
     rating_col = find_col(df, ["review_rating", "rating", "stars", "review_c"])
     if rating_col:
@@ -114,64 +238,118 @@ def _load_reviews(path: str) -> pd.DataFrame:
     return df
 
 
+def _stream_review_aggregates(path: str, chunksize: int, today: datetime | None = None):
+    """
+    Read reviews chunk by chunk and keep only per-slug partial sums, so memory
+    stays bounded by the number of restaurants rather than the file size.
+    Returns (empty df_rev with the cleaned columns, combined aggregates).
+    """
+    if not os.path.exists(path):
+        raise FileNotFoundError(f"Critical Error: Review data not found at {path}")
+
+    # One reference time for every chunk, so relative dates and the recency
+    # cutoffs agree no matter how long the file takes to stream
+    today = today or datetime.now()
+    c90, c180 = _recency_cutoffs(today)
+    empty, parts = None, []
+    # The pyarrow engine does not support chunksize
+    for chunk in pd.read_csv(path, encoding="utf-8-sig", chunksize=chunksize, engine="c"):
+        chunk = _clean_reviews(chunk, today)
+        if empty is None:
+            empty = chunk.iloc[:0]
+        part = _review_aggregates(chunk, c90, c180)
+        if part is not None:
+            parts.append(part)
+
+    agg = pd.concat(parts).groupby(level=0).sum() if parts else None
+    return empty if empty is not None else pd.DataFrame(), agg
+
+
 # ── Enrichment ────────────────────────────────────────────────────────────────────
-def _enrich_restaurants(df_rest: pd.DataFrame, df_rev: pd.DataFrame) -> pd.DataFrame:
-    r_url = find_col(df_rest, ["page_url", "url", "link"])
-    v_url = find_col(df_rev,  ["page_url", "url", "link"])
+def _recency_cutoffs(today: datetime | None = None):
+    today = today or datetime.now()
+    return today - timedelta(days=90), today - timedelta(days=180)
+
+
+def _review_aggregates(df_rev: pd.DataFrame, c90, c180) -> pd.DataFrame | None:
+    """
+    Per-slug partial sums (n, resp, rating_sum, rating_cnt, r90, r180).
+    Sums rather than means, so chunked results combine with a plain .sum().
+    """
+    v_url = find_col(df_rev, ["page_url", "url", "link"])
+    if not v_url:
+        return None
 
     resp_content_col = find_col(df_rev, ["owner_response_content"])
     resp_flag_col    = find_col(df_rev, ["owner_response"])
 
-    if r_url and v_url:
-        df_rest["_slug"] = df_rest[r_url].apply(_url_slug)
-        df_rev["_slug"]  = df_rev[v_url].apply(_url_slug)
-
-        rev_by_slug = {slug: grp for slug, grp in df_rev.groupby("_slug")}
-
-        rates, sm, rm = {}, {}, {}
-        c90  = datetime.now() - timedelta(days=90)
-        c180 = datetime.now() - timedelta(days=180)
-
-        for slug in df_rest["_slug"]:
-            sub = rev_by_slug.get(slug)
-            if sub is None or len(sub) == 0:
-                continue
-
-            responded = pd.Series([False] * len(sub), index=sub.index)
-
-            if resp_content_col and resp_content_col in sub.columns:
-                content_vals = sub[resp_content_col].astype(str).str.strip()
-                responded |= (
-                    sub[resp_content_col].notna()
-                    & (content_vals != "")
-                    & (content_vals.str.lower() != "nan")
-                )
-
-            if resp_flag_col and resp_flag_col in sub.columns:
-                flag_vals = sub[resp_flag_col].astype(str).str.strip()
-                responded |= (
-                    sub[resp_flag_col].notna()
-                    & (flag_vals != "")
-                    & (flag_vals.str.lower() != "nan")
-                )
-
-            rates[slug] = responded.sum() / len(sub)
-
-            if "review_rating" in sub.columns:
-                sm[slug] = ((sub["review_rating"].mean() - 1) / 4.0) * 100
-
-            if "normalized_date" in sub.columns:
-                d = pd.to_datetime(sub["normalized_date"])
-                rm[slug] = min(
-                    ((d > c90).sum() * 0.7 + (d > c180).sum() * 0.3) / len(sub),
-                    1.0,
-                )
-
-        df_rest["res_rate"]      = df_rest["_slug"].map(rates).fillna(0.0)
-        df_rest["sentiment"]     = df_rest["_slug"].map(sm).fillna(
-            ((df_rest["rating_n"] - 1) / 4.0) * 100
+    slugs = df_rev["_slug"] if "_slug" in df_rev.columns else _url_slugs(df_rev[v_url])
+
+    # Owner replied if either the response text or the response flag is filled
+    responded = pd.Series(False, index=df_rev.index)
+    for col in (resp_content_col, resp_flag_col):
+        if col:
+            vals = df_rev[col].astype(str).str.strip()
+            responded |= (
+                df_rev[col].notna()
+                & (vals != "")
+                & (vals.str.lower() != "nan")
+            )
+
+    d = df_rev["normalized_date"]
+
+    # One hash-groupby over all reviews instead of a filter per restaurant
+    return (
+        pd.DataFrame({
+            "_slug":      slugs,
+            "n":          1,
+            "resp":       responded.astype("int64"),
+            "rating_sum": df_rev["review_rating"],
+            "rating_cnt": df_rev["review_rating"].notna().astype("int64"),
+            "r90":        (d > c90).astype("int64"),
+            "r180":       (d > c180).astype("int64"),
+        })
+        .groupby("_slug", observed=True)
+        .sum()
+    )
+
+
+def _enrich_restaurants(
+    df_rest: pd.DataFrame,
+    df_rev:  pd.DataFrame,
+    agg:     pd.DataFrame | None = None,
+    today:   datetime | None = None,
+) -> pd.DataFrame:
+    r_url = find_col(df_rest, ["page_url", "url", "link"])
+    v_url = find_col(df_rev,  ["page_url", "url", "link"])
+
+    if agg is None and r_url and v_url:
+        # Categorical slug: groupbys and equality filters hash small integer codes
+        df_rev["_slug"] = _url_slugs(df_rev[v_url]).astype("category")
+        agg = _review_aggregates(df_rev, *_recency_cutoffs(today))
+
+    if r_url and agg is not None:
+        df_rest["_slug"] = _url_slugs(df_rest[r_url])
+
+        # Align the per-slug sums to df_rest rows as plain float arrays, then
+        # derive every metric column-wise; NaN marks restaurants without reviews
+        pos = agg.index.get_indexer(df_rest["_slug"])
+        n, resp, r_sum, r_cnt, r90, r180 = (
+            _align_to(pos, agg[c].to_numpy(dtype=float))
+            for c in ["n", "resp", "rating_sum", "rating_cnt", "r90", "r180"]
+        )
+        with np.errstate(divide="ignore", invalid="ignore"):
+            res_rate  = resp / n
+            sentiment = ((r_sum / r_cnt - 1) / 4.0) * 100
+            recency   = np.minimum((r90 * 0.7 + r180 * 0.3) / n, 1.0)
+
+        df_rest["res_rate"]      = np.where(np.isnan(res_rate), 0.0, res_rate)
+        df_rest["sentiment"]     = np.where(
+            np.isnan(sentiment),
+            ((df_rest["rating_n"].to_numpy(dtype=float) - 1) / 4.0) * 100,
+            sentiment,
         )
-        df_rest["recency_score"] = df_rest["_slug"].map(rm).fillna(0.5)
+        df_rest["recency_score"] = np.where(np.isnan(recency), 0.5, recency)
 
     else:
         np.random.seed(42)
@@ -182,6 +360,14 @@ def _enrich_restaurants(df_rest: pd.DataFrame, df_rev: pd.DataFrame) -> pd.DataF
     return df_rest
 
 
+def _align_to(pos: np.ndarray, values: np.ndarray) -> np.ndarray:
+    """values[pos] per row, NaN where get_indexer found no match (pos == -1)."""
+    out = np.full(len(pos), np.nan)
+    hit = pos >= 0
+    out[hit] = values[pos[hit]]
+    return out
+
+
 # ── Benchmarks ────────────────────────────────────────────────────────────────────
 def _compute_benchmarks(df_rest: pd.DataFrame) -> dict:
     return {
@@ -197,44 +383,105 @@ def _compute_benchmarks(df_rest: pd.DataFrame) -> dict:
 
 # ── Public helpers ────────────────────────────────────────────────────────────────
 def find_col(df: pd.DataFrame, candidates: list) -> str | None:
-    col_map = {c.lower(): c for c in df.columns}
+    return _find_col_cached(tuple(df.columns), tuple(candidates))
+
+
+@functools.lru_cache(maxsize=64)
+def _find_col_cached(columns: tuple, candidates: tuple) -> str | None:
+    col_map = {c.lower(): c for c in columns}
     for c in candidates:
         if c.lower() in col_map:
             return col_map[c.lower()]
     return None
 
 
-def _url_slug(url: str) -> str:
-    m = re.search(r"/place/([^/@]+)", str(url))
-    return m.group(1).lower() if m else str(url).lower()[:80]
-
-
-def _parse_int(x) -> int:
-    found = re.findall(r"\d+", str(x))
-    return int("".join(found[:2])) if found else 0
-
-
-def _parse_german_date(date_str) -> datetime:
-    today = datetime.now()
-    s = str(date_str).lower()
-    s = re.sub(r"^bearbeitet:\s*", "", s).strip()
-    n_match = re.search(r"\d+", s)
-    n = int(n_match.group()) if n_match else 1
-
-    if "einem monat" in s:  return today - timedelta(days=30)
-    if "monat"       in s:  return today - timedelta(days=n * 30)
-    if "einem jahr"  in s:  return today - timedelta(days=365)
-    if "jahr"        in s:  return today - timedelta(days=n * 365)
-    if "einer woche" in s:  return today - timedelta(days=7)
-    if "woche"       in s:  return today - timedelta(days=n * 7)
-    if "tag"         in s:  return today - timedelta(days=n)
-    if "stunde"      in s:  return today - timedelta(hours=n)
-    if "gestern"     in s:  return today - timedelta(days=1)
-    if "heute"       in s:  return today
-
-    for fmt in ["%d.%m.%Y", "%Y-%m-%d", "%d/%m/%Y"]:
+def _norm_url(urls: pd.Series) -> pd.Series:
+    """Canonical join key form of a URL column: trimmed and case-folded."""
+    return urls.astype("string").str.strip().str.lower()
+
+
+def _url_slugs(urls: pd.Series) -> pd.Series:
+    """Google Maps place slug per URL, falling back to the first 80 chars."""
+    urls  = _norm_url(urls)
+    slugs = urls.str.extract(r"/place/([^/@]+)", expand=False).str.strip()
+    return slugs.fillna(urls.str[:80])
+
+
+def _parse_ints(series: pd.Series) -> pd.Series:
+    """First two digit runs joined into an int ("(3.582)" -> 3582), 0 if none."""
+    runs = series.astype(str).str.extract(r"(\d+)(?:\D+(\d+))?")
+    digits = runs[0].str.cat(runs[1], na_rep="")
+    return pd.to_numeric(digits, errors="coerce").fillna(0).astype("int64")
+
+
+# Relative German phrases in match precedence:
+# (token, fixed offset in hours, hours per counted unit).
+_GERMAN_DATE_TOKENS = [
+    ("einem monat", 30 * 24,  None),
+    ("monat",       None,     30 * 24),
+    ("einem jahr",  365 * 24, None),
+    ("jahr",        None,     365 * 24),
+    ("einer woche", 7 * 24,   None),
+    ("woche",       None,     7 * 24),
+    ("tag",         None,     24),
+    ("stunde",      None,     1),
+    ("gestern",     24,       None),
+    ("heute",       0,        None),
+]
+_ABS_DATE_FORMATS = ["%d.%m.%Y", "%Y-%m-%d", "%d/%m/%Y"]
+_EDITED_RE = re.compile(r"^bearbeitet:\s*")
+_NUM_RE    = re.compile(r"(\d+)")
+
+
+def _parse_german_date(date_str, today: datetime | None = None) -> datetime:
+    """Scalar fallback of _parse_german_dates_vec for single values."""
+    today = today or datetime.now()
+    s = _EDITED_RE.sub("", str(date_str).lower()).strip()
+    n_match = _NUM_RE.search(s)
+    n = int(n_match.group(1)) if n_match else 1
+
+    for tok, fixed, unit in _GERMAN_DATE_TOKENS:
+        if tok in s:
+            return today - timedelta(hours=fixed if fixed is not None else n * unit)
+
+    for fmt in _ABS_DATE_FORMATS:
         try:
             return datetime.strptime(str(date_str), fmt)
         except Exception:
             pass
-    return today - timedelta(days=90)
\ No newline at end of file
+    return today - timedelta(days=90)
+
+
+def _parse_german_dates_vec(series: pd.Series, today: datetime | None = None) -> pd.Series:
+    """Vectorized _parse_german_date over a whole column."""
+    today = pd.Timestamp(today) if today is not None else pd.Timestamp.now()
+    s = (
+        series.astype(str)
+        .str.lower()
+        .str.replace(_EDITED_RE, "", regex=True)
+        .str.strip()
+    )
+    n = (
+        pd.to_numeric(s.str.extract(_NUM_RE, expand=False), errors="coerce")
+        .fillna(1)
+        .astype("int64")
+        .to_numpy()
+    )
+
+    conds, hours = [], []
+    for tok, fixed, unit in _GERMAN_DATE_TOKENS:
+        conds.append(s.str.contains(tok, regex=False, na=False).to_numpy())
+        hours.append(fixed if fixed is not None else n * unit)
+    matched = np.logical_or.reduce(conds)
+    offset  = np.select(conds, hours, default=90 * 24)
+
+    out = pd.Series(today - pd.to_timedelta(offset, unit="h"), index=series.index)
+
+    # Absolute dates only for rows without a relative phrase
+    raw = series[~matched].astype(str)
+    parsed = pd.Series(pd.NaT, index=raw.index, dtype="datetime64[ns]")
+    for fmt in _ABS_DATE_FORMATS:
+        parsed = parsed.fillna(pd.to_datetime(raw, format=fmt, errors="coerce"))
+    parsed = parsed.dropna()
+    out.loc[parsed.index] = parsed
+    return out
@@ -546,7 +546,7 @@ def _momentum_page(res_name, res_data, scores, momentum_data, df_rest, df_rev):
     rc = None
     if '_slug' in df_rest.columns and '_slug' in df_rev.columns:
         try:
-            rest_slug = df_rest[df_rest['name'] == res_name].iloc[0]['_slug']
+            rest_slug = res_data['_slug']
             sub = df_rev[df_rev['_slug'] == rest_slug]
             if len(sub) > 0 and 'review_rating' in df_rev.columns:
                 rc = sub['review_rating'].value_counts().sort_index(ascending=False)
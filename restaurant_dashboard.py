@@ -1,5 +1,12 @@
 import streamlit as st
 import pandas as pd
+import numpy as np
+
+try:
+    import pyarrow  # noqa: F401  – enables pandas' multithreaded CSV engine
+    CSV_ENGINE = "pyarrow"
+except ImportError:
+    CSV_ENGINE = "c"
 
 # ======================================================
 # CONFIG
@@ -20,7 +27,7 @@ st.markdown("### Turkish vs Sushi Market Comparison & Insights")
 @st.cache_data
 def load_data(file):
     if file.name.endswith(".csv"):
-        return pd.read_csv(file)
+        return pd.read_csv(file, engine=CSV_ENGINE)
     else:
         return pd.read_excel(file)
 
@@ -38,17 +45,36 @@ def clean_rating(col):
     )
 
 
-def classify_cuisine(row):
-    text = (str(row["Name"]) + " " + str(row["Address"])).lower()
+TURKISH_PATTERN = r"türk|turk|döner|doner|kebab|istanbul|ankara|izmir"
+SUSHI_PATTERN = r"sushi|japan|ramen|tokyo|bento|asiatisch|asia"
+
+
+def add_cuisine(df):
+    text = (
+        df["Name"].fillna("").astype(str) + " " + df["Address"].fillna("").astype(str)
+    ).str.lower()
+
+    turkish = text.str.contains(TURKISH_PATTERN, regex=True)
+    sushi = text.str.contains(SUSHI_PATTERN, regex=True)
+
+    # Categorical: value_counts / groupby / isin work on integer codes
+    return df.assign(
+        Cuisine=pd.Categorical(
+            np.where(turkish, "Turkish", np.where(sushi, "Sushi", "Other"))
+        )
+    )
+
+
+@st.cache_data
+def to_csv_bytes(df):
+    return df.to_csv(index=False).encode("utf-8")
 
-    turkish = ["türk", "turk", "döner", "doner", "kebab", "istanbul", "ankara", "izmir"]
-    sushi = ["sushi", "japan", "ramen", "tokyo", "bento", "asiatisch", "asia"]
 
-    if any(w in text for w in turkish):
-        return "Turkish"
-    elif any(w in text for w in sushi):
-        return "Sushi"
-    return "Other"
+@st.cache_data
+def prepare_df(file):
+    df = load_data(file)
+    df["Rating"] = clean_rating(df["Rating"])
+    return add_cuisine(df)
 
 
 # ======================================================
@@ -66,9 +92,7 @@ if not file:
 # ======================================================
 # LOAD + PROCESS
 # ======================================================
-df = load_data(file)
-df["Rating"] = clean_rating(df["Rating"])
-df["Cuisine"] = df.apply(classify_cuisine, axis=1)
+df = prepare_df(file)
 
 
 # ======================================================
@@ -86,14 +110,12 @@ min_rating = st.sidebar.slider("Minimum rating", 0.0, 5.0, 0.0, 0.1)
 
 search = st.sidebar.text_input("Search restaurant")
 
-df_filtered = df.copy()
-df_filtered = df_filtered[df_filtered["Cuisine"].isin(cuisine)]
-df_filtered = df_filtered[df_filtered["Rating"] >= min_rating]
+mask = df["Cuisine"].isin(cuisine) & (df["Rating"] >= min_rating)
 
 if search:
-    df_filtered = df_filtered[
-        df_filtered["Name"].str.contains(search, case=False)
-    ]
+    mask &= df["Name"].str.contains(search, case=False, na=False)
+
+df_filtered = df.loc[mask]
 
 
 # ======================================================
@@ -110,7 +132,10 @@ with tab1:
     total = len(df_filtered)
     avg = round(df_filtered["Rating"].mean(), 2)
     best = round(df_filtered["Rating"].max(), 2)
-    top_cuisine = df_filtered["Cuisine"].value_counts().idxmax()
+    # Categorical value_counts lists every category; drop filtered-out ones
+    cuisine_counts = df_filtered["Cuisine"].value_counts()
+    cuisine_counts = cuisine_counts[cuisine_counts > 0]
+    top_cuisine = cuisine_counts.idxmax()
 
     st.subheader("Key Metrics")
 
@@ -126,11 +151,11 @@ with tab1:
 
     with c1:
         st.subheader("Cuisine Distribution")
-        st.bar_chart(df_filtered["Cuisine"].value_counts())
+        st.bar_chart(cuisine_counts)
 
     with c2:
         st.subheader("Average Rating by Cuisine")
-        avg_rating = df_filtered.groupby("Cuisine")["Rating"].mean()
+        avg_rating = df_filtered.groupby("Cuisine", observed=True)["Rating"].mean()
         st.bar_chart(avg_rating)
 
     best_cuisine = avg_rating.idxmax()
@@ -166,7 +191,7 @@ with tab2:
     st.subheader("Cuisine Summary")
 
     summary = (
-        df_filtered.groupby("Cuisine")
+        df_filtered.groupby("Cuisine", observed=True)
         .agg(
             Count=("Name", "count"),
             Avg_Rating=("Rating", "mean")
@@ -186,7 +211,7 @@ with tab3:
 
     st.dataframe(df_filtered, use_container_width=True)
 
-    csv = df_filtered.to_csv(index=False).encode("utf-8")
+    csv = to_csv_bytes(df_filtered)
 
     st.download_button(
         "⬇️ Download filtered data",
@@ -41,10 +41,16 @@ from datetime import datetime
 from data_audit import find_col
 
 
+def get_restaurant_row(res_name: str, df_rest: pd.DataFrame) -> pd.Series:
+    """O(1) row lookup on the name-indexed df_rest; raises KeyError if missing."""
+    row = df_rest.loc[res_name]
+    return row.iloc[0] if isinstance(row, pd.DataFrame) else row
+
+
 def compute_dimension_scores(res_name: str, df_rest: pd.DataFrame, df_rev: pd.DataFrame) -> dict:
     try:
-        row = df_rest[df_rest["name"] == res_name].iloc[0]
-    except IndexError:
+        row = get_restaurant_row(res_name, df_rest)
+    except KeyError:
         return {k: 0 for k in [
             "Reputation", "Responsiveness", "Digital Presence",
             "Intelligence", "Visibility", "Composite",
@@ -100,44 +106,73 @@ def get_gap_analysis(scores: dict, benchmarks: dict) -> dict:
     return dict(sorted(gaps.items(), key=lambda x: x[1], reverse=True))
 
 
-def compute_momentum(res_name: str, df_rev: pd.DataFrame, df_rest: pd.DataFrame = None) -> pd.DataFrame:
-    """Compute monthly review velocity.  df_rest must be passed so _slug matching works."""
+def build_monthly_by_slug(df_rev: pd.DataFrame) -> dict:
+    """Monthly review counts per _slug, built once so compute_momentum is a dict lookup."""
+    url_col = find_col(df_rev, ["page_url", "url", "link"])
+    if url_col is None or "normalized_date" not in df_rev.columns:
+        return {}
+
+    if "_slug" in df_rev.columns:
+        slugs = df_rev["_slug"]
+    else:
+        from data_audit import _url_slugs
+        slugs = _url_slugs(df_rev[url_col])
+
+    monthly = (
+        pd.DataFrame({
+            "_slug":  slugs,
+            "_month": df_rev["normalized_date"].dt.to_period("M"),
+        })
+        .groupby(["_slug", "_month"], observed=True)
+        .size()
+        .reset_index(name="count")
+    )
+    monthly["month"] = monthly["_month"].dt.to_timestamp()
+    return {
+        slug: grp[["month", "count"]].reset_index(drop=True)
+        for slug, grp in monthly.groupby("_slug", observed=True)
+    }
+
+
+def compute_momentum(
+    res_name: str,
+    df_rev: pd.DataFrame,
+    df_rest: pd.DataFrame = None,
+    monthly_by_slug: dict = None,
+) -> pd.DataFrame:
+    """Compute monthly review velocity.  df_rest must be passed so _slug matching works.
+
+    Pass a precomputed build_monthly_by_slug(df_rev) to skip the per-call groupby.
+    """
     try:
-        url_col = find_col(df_rev, ["page_url", "url", "link"])
-        if url_col is None or "normalized_date" not in df_rev.columns:
+        if monthly_by_slug is None:
+            monthly_by_slug = build_monthly_by_slug(df_rev)
+        if not monthly_by_slug:
             return _synthetic_momentum()
 
-        subset = pd.DataFrame()
+        monthly = None
 
         # Primary: slug-based match using pre-computed _slug in df_rest
         if df_rest is not None and "_slug" in df_rest.columns:
             try:
-                rest_row    = df_rest[df_rest["name"] == res_name].iloc[0]
-                target_slug = rest_row["_slug"]
-                if "_slug" not in df_rev.columns:
-                    from data_audit import _url_slug
-                    df_rev["_slug"] = df_rev[url_col].apply(_url_slug)
-                subset = df_rev[df_rev["_slug"] == target_slug].copy()
-            except (IndexError, KeyError):
+                target_slug = get_restaurant_row(res_name, df_rest)["_slug"]
+                monthly     = monthly_by_slug.get(target_slug)
+            except KeyError:
                 pass
 
         # Fallback: derive slug from restaurant name
-        if len(subset) == 0:
-            from data_audit import _url_slug
-            if "_slug" not in df_rev.columns:
-                df_rev["_slug"] = df_rev[url_col].apply(_url_slug)
-            name_slug = res_name.lower().replace(" ", "+")
-            subset = df_rev[
-                df_rev["_slug"].str.contains(name_slug[:20], na=False, regex=False)
-            ].copy()
-
-        if len(subset) == 0:
-            return _synthetic_momentum()
-
-        subset["_month"] = pd.to_datetime(subset["normalized_date"]).dt.to_period("M")
-        monthly = subset.groupby("_month").size().reset_index(name="count")
-        monthly["month"] = monthly["_month"].dt.to_timestamp()
-        return monthly[["month", "count"]].sort_values("month").tail(13).reset_index(drop=True)
+        if monthly is None:
+            name_slug = res_name.lower().replace(" ", "+")[:20]
+            matches   = [m for slug, m in monthly_by_slug.items() if name_slug in slug]
+            if not matches:
+                return _synthetic_momentum()
+            monthly = (
+                pd.concat(matches)
+                .groupby("month", as_index=False)["count"]
+                .sum()
+            )
+
+        return monthly.sort_values("month").tail(13).reset_index(drop=True)
 
     except Exception:
         return _synthetic_momentum()
@@ -152,7 +187,7 @@ def _synthetic_momentum() -> pd.DataFrame:
 def get_silent_winner_flag(res_name: str, df_rest: pd.DataFrame) -> bool:
     """High rating but low responsiveness → big Praxiotech opportunity."""
     try:
-        row = df_rest[df_rest["name"] == res_name].iloc[0]
+        row = get_restaurant_row(res_name, df_rest)
         return (
             float(row.get("rating_n", 0) or 0) >= 4.5
             and float(row.get("res_rate", 1) or 1) < 0.30
@@ -163,7 +198,7 @@ def get_silent_winner_flag(res_name: str, df_rest: pd.DataFrame) -> bool:
 
 def get_customer_persona(res_name: str, df_rest: pd.DataFrame, df_rev: pd.DataFrame) -> dict:
     try:
-        row       = df_rest[df_rest["name"] == res_name].iloc[0]
+        row       = get_restaurant_row(res_name, df_rest)
         rating    = float(row.get("rating_n", 4.0) or 4.0)
         price_col = find_col(df_rest, ["price"])
         price     = str(row.get(price_col, "20-30") or "20-30") if price_col else "20-30"